@@ -8,46 +8,238 @@ Usage:
   pool stats Raymond      # Show player statistics
 """
 
+import atexit
+import bisect
+import collections
+import functools
+import itertools
 import json
+import os
+import pickle
 import sys
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson  # much faster C encoder/decoder, optional
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np  # vectorized ranking sort for big leagues, optional
+except ImportError:
+    np = None
+
+def _json_loads(data):
+    """Parse JSON from bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj, indent=False):
+    """Encode obj to UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+class _PlayerRecord:
+    """Compact per-player aggregate; slots avoid a ~240-byte dict per player"""
+    __slots__ = ("wins", "losses", "vs")
+
+    def __init__(self):
+        self.wins = 0
+        self.losses = 0
+        self.vs = {}
+
+    @classmethod
+    def from_dict(cls, d):
+        rec = cls()
+        rec.wins = d["wins"]
+        rec.losses = d["losses"]
+        rec.vs = d.get("vs")  # None marks pre-"vs" files needing the backfill
+        return rec
+
+    def to_dict(self):
+        return {"wins": self.wins, "losses": self.losses, "vs": self.vs}
+
 class PoolLeague:
+    RECENT_MAXLEN = 256  # bounded buffer backing show_history
+    NUMPY_RANKING_THRESHOLD = 64  # below this, the Python sort wins on constants
+
+    README_HEADER = (
+        "\n## Pool League Rankings\n\n"
+        "| Rank | Player   | Wins | Losses | Total | Win Rate |\n"
+        "|------|----------|------|--------|-------|----------|\n"
+    )
+    README_ROW = "| {rank}    | {player} | {wins}  | {losses}   | {total}  | {win_rate:.1f}% |\n"
+
     def __init__(self, data_file="match_data.json"):
-        self.data_file = Path(data_file)
+        self.data_file = Path(data_file)  # legacy combined file, kept as migration source
+        self.players_file = self.data_file.with_name("players.json")
+        self.matches_file = self.data_file.with_name("matches.jsonl")
+        self.matches_cache_file = self.matches_file.with_name(self.matches_file.name + ".cache.pkl")
+        self._matches_fp = None  # append handle, opened lazily on first add
+        self._defer_readme = False  # set inside a `with` block to batch README updates
+        self._readme_dirty = False
+        self._last_readme_key = None  # rankings fingerprint of the last README write
         self.data = self.load_data()
-    
+        self._recent = None  # bounded buffer, seeded when the match log is first read
+        if self._ensure_head_to_head():
+            self.save_data()  # persist the backfill so it runs only once
+        # Rankings cache; None means stale/unbuilt, rebuilt on first get_rankings
+        self._rankings = None
+        self._ranking_index = None
+
+    def __enter__(self):
+        """Defer README regeneration until the end of the block (bulk imports)"""
+        self._defer_readme = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._defer_readme = False
+        if self._readme_dirty and exc_type is None:
+            self.update_readme_with_rankings()
+        self._readme_dirty = False
+        return False
+
     def load_data(self):
-        """Load data file"""
-        if not self.data_file.exists() or self.data_file.stat().st_size == 0:
-            # Initialize with default data if file doesn't exist or is empty
+        """Load data files, migrating from the legacy combined file if needed"""
+        if not self.players_file.exists():
+            if self.data_file.exists() and self.data_file.stat().st_size > 0:
+                return self._migrate_legacy_file()
+            # Initialize with default data if no files exist yet
             initial_data = {"matches": [], "players": {}}
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(initial_data, f, ensure_ascii=False, indent=2)
+            with open(self.players_file, 'wb') as f:
+                f.write(_json_dumps(initial_data["players"], indent=True))
             return initial_data
-        
-        with open(self.data_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
+
+        players = {
+            name: _PlayerRecord.from_dict(stats)
+            for name, stats in _json_loads(self.players_file.read_bytes()).items()
+        }
+
+        # Matches are parsed lazily; rankings and stats only need the aggregates
+        return {"matches": None, "players": players}
+
+    def _get_matches(self):
+        """Parse the match log on first use and seed the recent-match buffer"""
+        if self.data["matches"] is None:
+            self.data["matches"] = self._load_matches_file()
+        if self._recent is None:
+            self._recent = collections.deque(self.data["matches"][-self.RECENT_MAXLEN:],
+                                             maxlen=self.RECENT_MAXLEN)
+        return self.data["matches"]
+
+    def _load_matches_file(self):
+        """Parse the match log, using a pickle cache keyed on its mtime and size"""
+        if not self.matches_file.exists():
+            return []
+        stat = self.matches_file.stat()
+
+        # Unpickling the cached parse is much faster than re-parsing the JSON
+        try:
+            with open(self.matches_cache_file, 'rb') as f:
+                mtime_ns, size, matches = pickle.load(f)
+            if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                return matches
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            pass
+
+        matches = []
+        with open(self.matches_file, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    matches.append(_json_loads(line))
+        self._backfill_date_short(matches)
+
+        try:
+            with open(self.matches_cache_file, 'wb') as f:
+                pickle.dump((stat.st_mtime_ns, stat.st_size, matches), f, protocol=5)
+        except OSError:
+            pass
+        return matches
+
+    def _migrate_legacy_file(self):
+        """One-shot migration of the old match_data.json into the split storage"""
+        data = _json_loads(self.data_file.read_bytes())
+        self._backfill_date_short(data["matches"])
+        with open(self.matches_file, 'wb') as f:
+            for match in data["matches"]:
+                f.write(_json_dumps(match) + b"\n")
+        data["players"] = {
+            name: _PlayerRecord.from_dict(stats)
+            for name, stats in data["players"].items()
+        }
+        with open(self.players_file, 'wb') as f:
+            f.write(_json_dumps(self._players_as_dicts(data["players"]), indent=True))
+        return data
+
+    @staticmethod
+    def _players_as_dicts(players):
+        """Plain-dict view of the slotted player records, for serialization"""
+        return {name: rec.to_dict() for name, rec in players.items()}
+
+    @staticmethod
+    def _backfill_date_short(matches):
+        """Fill in the display date for records written before it was stored"""
+        for match in matches:
+            if "date_short" not in match:
+                match["date_short"] = datetime.fromisoformat(match["date"]).strftime("%m/%d %H:%M")
+
+    def _ensure_head_to_head(self):
+        """One-shot backfill of per-player head-to-head tables from the match log"""
+        players = self.data["players"]
+        if all(rec.vs is not None for rec in players.values()):
+            return False
+
+        for rec in players.values():
+            rec.vs = {}
+        for match in self._get_matches():
+            winner, loser = match["winner"], match["loser"]
+            if winner in players:
+                players[winner].vs.setdefault(loser, [0, 0])[0] += 1
+            if loser in players:
+                players[loser].vs.setdefault(winner, [0, 0])[1] += 1
+        return True
+
     def save_data(self):
-        """Save data to file"""
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        """Save player aggregates (matches are appended to the JSONL log instead)"""
+        # Serialize to one buffer, write a temp file in a single call, then swap
+        # it in atomically so a crash mid-write can't corrupt players.json
+        payload = _json_dumps(self._players_as_dicts(self.data["players"]), indent=True)
+        tmp = self.players_file.with_suffix('.json.tmp')
+        tmp.write_bytes(payload)
+        os.replace(tmp, self.players_file)
+
+    def _append_match(self, match):
+        """Append one match to the JSONL log without rewriting it"""
+        if self._matches_fp is None:
+            self._matches_fp = open(self.matches_file, 'ab', buffering=1 << 16)
+            atexit.register(self._matches_fp.close)
+        self._matches_fp.write(_json_dumps(match) + b"\n")
+        self._matches_fp.flush()
+        # The log changed on disk, so the parsed cache is stale
+        self.matches_cache_file.unlink(missing_ok=True)
     
     # Function to parse date and convert to ISO format
-    def parse_date(self, date_str):
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def parse_date(date_str):
         try:
-            # Try parsing the date in 'YYYY-M-D' format
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+            # fromisoformat is much faster than strptime for padded dates
+            date_obj = datetime.fromisoformat(date_str)
         except ValueError:
-            # If parsing fails, return None
-            return None
+            try:
+                # Fall back for unpadded 'YYYY-M-D' input
+                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+            except ValueError:
+                # If parsing fails, return None
+                return None
         return date_obj.isoformat()
     
     def add_match(self, winner, loser, date=None):
         """Add match result"""
-        print(f"Adding match: {winner} beats {loser}")  # Debugging print statement
         # Record match
         match_date = self.parse_date(date) if date else datetime.now().isoformat()
         if not match_date:
@@ -55,52 +247,118 @@ class PoolLeague:
             return False
         match = {
             "date": match_date,
+            # Pre-format the display date so show_history never re-parses ISO strings
+            "date_short": datetime.fromisoformat(match_date).strftime("%m/%d %H:%M"),
             "winner": winner,
             "loser": loser
         }
-        self.data["matches"].append(match)
-        
+        # Only mirror into the in-memory structures that have been materialized;
+        # an unloaded log will pick the match up from disk when first parsed
+        if self.data["matches"] is not None:
+            self.data["matches"].append(match)
+        if self._recent is not None:
+            self._recent.append(match)
+        self._append_match(match)
+
         # Update player statistics
         self.update_player_stats(winner, loser)
         self.save_data()
         
-        # Update README.md with current rankings
-        self.update_readme_with_rankings()
-        
+        # Update README.md with current rankings (deferred inside a `with` block)
+        if self._defer_readme:
+            self._readme_dirty = True
+        else:
+            self.update_readme_with_rankings()
+
         print(f"✅ Match recorded: {winner} defeated {loser}")
         return True
     
     def update_player_stats(self, winner, loser):
         """Update player statistics"""
-        # Initialize player data
-        for player in [winner, loser]:
-            if player not in self.data["players"]:
-                self.data["players"][player] = {"wins": 0, "losses": 0}
-        
+        # Bind the records once instead of re-walking the nested structures per field
+        players = self.data["players"]
+        winner_rec = players.setdefault(winner, _PlayerRecord())
+        loser_rec = players.setdefault(loser, _PlayerRecord())
+
         # Update win/loss records
-        self.data["players"][winner]["wins"] += 1
-        self.data["players"][loser]["losses"] += 1
-    
-    def get_rankings(self):
-        """Get rankings"""
-        rankings = []
-        for player, stats in self.data["players"].items():
-            wins = stats["wins"]
-            losses = stats["losses"]
-            total = wins + losses
-            win_rate = wins / total if total > 0 else 0
-            
-            rankings.append({
-                "player": player,
-                "wins": wins,
-                "losses": losses,
-                "total": total,
-                "win_rate": win_rate
-            })
-        
+        winner_rec.wins += 1
+        loser_rec.losses += 1
+
+        # Update head-to-head records
+        winner_rec.vs.setdefault(loser, [0, 0])[0] += 1
+        loser_rec.vs.setdefault(winner, [0, 0])[1] += 1
+
+        # Keep the cached rankings in sync with the new records
+        self._update_ranking_entry(winner)
+        self._update_ranking_entry(loser)
+
+    @staticmethod
+    def _ranking_key(entry):
         # Sort by win rate, then by number of wins if win rates are equal
-        rankings.sort(key=lambda x: (x["win_rate"], x["wins"]), reverse=True)
-        return rankings
+        return (-entry["win_rate"], -entry["wins"])
+
+    @staticmethod
+    def _make_ranking_entry(player, stats):
+        wins = stats.wins
+        losses = stats.losses
+        total = wins + losses
+        return {
+            "player": player,
+            "wins": wins,
+            "losses": losses,
+            "total": total,
+            "win_rate": wins / total if total > 0 else 0
+        }
+
+    def _build_rankings(self):
+        """Build the sorted rankings cache from the player records"""
+        players = self.data["players"]
+        if np is not None and len(players) >= self.NUMPY_RANKING_THRESHOLD:
+            self._rankings = self._build_rankings_numpy(players)
+        else:
+            self._rankings = [
+                self._make_ranking_entry(player, stats)
+                for player, stats in players.items()
+            ]
+            self._rankings.sort(key=self._ranking_key)
+        self._ranking_index = {entry["player"]: entry for entry in self._rankings}
+
+    @staticmethod
+    def _build_rankings_numpy(players):
+        """Vectorized rankings build: lexsort avoids a Python key call per player"""
+        names = list(players)
+        wins = np.array([players[p].wins for p in names], dtype=np.int64)
+        losses = np.array([players[p].losses for p in names], dtype=np.int64)
+        totals = wins + losses
+        win_rates = np.where(totals > 0, wins / np.maximum(totals, 1), 0.0)
+        order = np.lexsort((-wins, -win_rates))  # last key is the primary one
+        return [
+            {
+                "player": names[i],
+                "wins": int(wins[i]),
+                "losses": int(losses[i]),
+                "total": int(totals[i]),
+                "win_rate": float(win_rates[i])
+            }
+            for i in order
+        ]
+
+    def _update_ranking_entry(self, player):
+        """Re-insert a single player's entry into the sorted rankings cache"""
+        if self._rankings is None:
+            return  # nothing cached yet; the first get_rankings builds from scratch
+        old_entry = self._ranking_index.get(player)
+        if old_entry is not None:
+            self._rankings.remove(old_entry)
+        entry = self._make_ranking_entry(player, self.data["players"][player])
+        bisect.insort(self._rankings, entry, key=self._ranking_key)
+        self._ranking_index[player] = entry
+
+    def get_rankings(self):
+        """Get rankings (cached; built lazily, then kept sorted incrementally)"""
+        if self._rankings is None:
+            self._build_rankings()
+        return self._rankings
     
     def show_rankings(self):
         """Display rankings"""
@@ -124,18 +382,22 @@ class PoolLeague:
     
     def show_history(self, limit=10):
         """Show match history"""
-        matches = self.data["matches"][-limit:]  # Recent matches
-        
+        all_matches = self._get_matches()
+        if limit > len(self._recent) and len(all_matches) > len(self._recent):
+            # Asked for more than the bounded buffer holds; fall back to the full list
+            matches = list(reversed(all_matches[-limit:]))
+        else:
+            matches = list(itertools.islice(reversed(self._recent), limit))  # Newest first
+
         if not matches:
             print("📝 No match records available")
             return
-        
+
         print(f"\n📝 Last {len(matches)} matches")
         print("=" * 50)
-        
-        for match in reversed(matches):  # Newest first
-            date = datetime.fromisoformat(match["date"]).strftime("%m/%d %H:%M")
-            print(f"{date} | {match['winner']} > {match['loser']}")
+
+        for match in matches:
+            print(f"{match['date_short']} | {match['winner']} > {match['loser']}")
         
         print("=" * 50)
     
@@ -146,8 +408,8 @@ class PoolLeague:
             return
         
         stats = self.data["players"][player]
-        wins = stats["wins"]
-        losses = stats["losses"]
+        wins = stats.wins
+        losses = stats.losses
         total = wins + losses
         win_rate = wins / total if total > 0 else 0
         
@@ -158,55 +420,44 @@ class PoolLeague:
         print(f"Total matches: {total}")
         print(f"Win rate: {win_rate*100:.1f}%")
         
-        # Find head-to-head records
-        vs_stats = {}
-        for match in self.data["matches"]:
-            if match["winner"] == player:
-                opponent = match["loser"]
-                vs_stats[opponent] = vs_stats.get(opponent, {"wins": 0, "losses": 0})
-                vs_stats[opponent]["wins"] += 1
-            elif match["loser"] == player:
-                opponent = match["winner"]
-                vs_stats[opponent] = vs_stats.get(opponent, {"wins": 0, "losses": 0})
-                vs_stats[opponent]["losses"] += 1
-        
+        # Head-to-head records are maintained incrementally on the player record
+        vs_stats = stats.vs or {}
         if vs_stats:
             print("\nHead-to-head records:")
-            for opponent, record in vs_stats.items():
-                print(f"  vs {opponent}: {record['wins']}W {record['losses']}L")
+            for opponent, (vs_wins, vs_losses) in vs_stats.items():
+                print(f"  vs {opponent}: {vs_wins}W {vs_losses}L")
         
         print("=" * 30)
 
     def update_readme_with_rankings(self):
         """Generate markdown table of rankings and update README.md"""
         rankings = self.get_rankings()
+
+        # Skip the rewrite when the table would come out identical
+        readme_key = tuple((r["player"], r["wins"], r["losses"]) for r in rankings)
+        if readme_key == self._last_readme_key:
+            return
+        self._last_readme_key = readme_key
+
+        # Generate markdown table in one join instead of quadratic string appends
+        rows = [
+            self.README_ROW.format(rank=i, player=player["player"], wins=player["wins"],
+                                   losses=player["losses"], total=player["total"],
+                                   win_rate=player["win_rate"] * 100)
+            for i, player in enumerate(rankings, 1)
+        ]
+        md_table = self.README_HEADER + "".join(rows)
         
-        # Generate markdown table
-        md_table = "\n## Pool League Rankings\n\n"
-        md_table += "| Rank | Player   | Wins | Losses | Total | Win Rate |\n"
-        md_table += "|------|----------|------|--------|-------|----------|\n"
-        
-        for i, player in enumerate(rankings, 1):
-            win_rate_str = f"{player['win_rate']*100:.1f}%"
-            md_table += f"| {i}    | {player['player']} | {player['wins']}  | {player['losses']}   | {player['total']}  | {win_rate_str} |\n"
-        
-        # Read the current README.md
+        # Read the current README.md in one call
         readme_path = Path('README.md')
-        if readme_path.exists():
-            with open(readme_path, 'r', encoding='utf-8') as f:
-                readme_content = f.read()
-        else:
-            readme_content = ""
-        
-        # Replace or add the rankings section
-        if "## Pool League Rankings" in readme_content:
-            readme_content = readme_content.split("## Pool League Rankings")[0] + md_table
-        else:
-            readme_content += md_table
-        
+        readme_content = readme_path.read_text(encoding='utf-8') if readme_path.exists() else ""
+
+        # Replace or add the rankings section: one scan, one slice
+        idx = readme_content.find("## Pool League Rankings")
+        prefix = readme_content if idx < 0 else readme_content[:idx]
+
         # Write updated content back to README.md
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        readme_path.write_text(prefix + md_table, encoding='utf-8')
         
         print("✅ README.md updated with current rankings.")
 
@@ -218,52 +469,46 @@ def print_help():
     print("  pool history             # Show match history")
     print("  pool stats Thomas        # Show player statistics")
 
+# Command table: expected argument count, whether the command needs league data,
+# and handler, replacing the if/elif ladder
+HANDLERS = {
+    'show': (1, True, lambda league, args: league.show_rankings()),
+    'history': (1, True, lambda league, args: league.show_history()),
+    'help': (1, False, lambda league, args: print_help()),
+    'stats': (2, True, lambda league, args: league.show_player_stats(args[1])),
+}
+
 def main():
-    league = PoolLeague()
-    
+    args = sys.argv[1:]
+
     # No arguments, show rankings
-    if len(sys.argv) == 1:
-        print("No arguments provided, showing rankings.")  # Debugging print statement
-        league.show_rankings()
+    if not args:
+        PoolLeague().show_rankings()
         return
-    
-    args = sys.argv[1:]
-   #print(f"Arguments received: {args}")  # Debugging print statement
-    
+
     # Handle adding match with optional date: Thomas - Raymond -d 2025-5-20
     if len(args) >= 3 and args[1] == '-':
-        #print("Adding match with arguments:", args)  # Debugging print statement
         winner, arrow, loser = args[:3]
         date = None
-        
+
         # Check for -d flag
         if len(args) > 4 and args[3] == '-d':
             date = args[4]
-            print(f"Date specified: {date}")  # Debugging print statement
-        
-        league.add_match(winner, loser, date)
+
+        league = PoolLeague()
+        with league:
+            league.add_match(winner, loser, date)
         league.show_rankings()  # Show rankings after adding
         return
-    
-    # Handle other commands
-    if len(args) == 1:
-        command = args[0].lower()
-        #print(f"Single command received: {command}")  # Debugging print statement
-        
-        if command == 'show':
-            league.show_rankings()
-        elif command == 'history':
-            league.show_history()
-        elif command == 'help':
-            print_help()
-        else:
-            print(f"❌ Unknown command: {command}")
-            print_help()
-    
-    elif len(args) == 2 and args[0].lower() == 'stats':
-        #print(f"Stats command for player: {args[1]}")  # Debugging print statement
-        league.show_player_stats(args[1])
-    
+
+    # Handle other commands; only load the data files when the handler needs them
+    command = args[0].lower()
+    entry = HANDLERS.get(command)
+    if entry is not None and len(args) == entry[0]:
+        entry[2](PoolLeague() if entry[1] else None, args)
+    elif len(args) == 1:
+        print(f"❌ Unknown command: {command}")
+        print_help()
     else:
         print("❌ Invalid command format")
         print_help()